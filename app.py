@@ -1,8 +1,10 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, send_file, flash
+import threading
+import uuid
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify
 
 # Import the modified generation functions
-from generator import run_generation, get_summary_data
+from generator import run_generation, get_summary_data, stream_package
 
 # --- Flask Setup ---
 app = Flask(__name__)
@@ -15,6 +17,56 @@ AVAILABLE_PROVIDERS = {
     "warnerbros": ["localnow"]
 }
 
+# In-process generation jobs, keyed by job id. Jobs live in this worker's
+# memory, so the app must run as a single (gunicorn) worker process.
+JOBS = {}
+# Finished jobs are kept for their results pages; older ones are dropped
+MAX_FINISHED_JOBS = 20
+# run_generation wipes and rebuilds GENERATED_PACKAGES, so jobs run one at a time
+GENERATION_LOCK = threading.Lock()
+# The package currently in GENERATED_PACKAGES and how many downloads are streaming
+# it. A generation waits for those downloads before wiping the folder.
+PACKAGE = {"zip_filename": None, "downloads": 0}
+PACKAGE_CHANGED = threading.Condition()
+
+def start_generation_job(mode, manual_configs=None):
+    job_id = uuid.uuid4().hex
+    job = {"state": "queued", "progress": 0, "zip_filename": None, "message": "",
+           "content_summary": [], "file_summary": []}
+    JOBS[job_id] = job
+    finished = [old_id for old_id, old_job in list(JOBS.items()) if old_job["state"] in ("finished", "failed")]
+    for old_id in finished[:-MAX_FINISHED_JOBS]:
+        JOBS.pop(old_id, None)
+
+    def progress_cb(done, total):
+        job["progress"] = int(done * 100 / total)
+
+    def worker():
+        with GENERATION_LOCK:
+            with PACKAGE_CHANGED:
+                # Links to the old package stop working from here on
+                PACKAGE["zip_filename"] = None
+                PACKAGE_CHANGED.wait_for(lambda: PACKAGE["downloads"] == 0)
+            job["state"] = "running"
+            try:
+                zip_filename, job["message"] = run_generation(mode, manual_configs, progress_cb=progress_cb)
+                if zip_filename:
+                    # Summarise this job's own output before a later job replaces it
+                    job["content_summary"], job["file_summary"] = get_summary_data()
+                job["zip_filename"] = zip_filename
+            except Exception as e:
+                app.logger.exception("Generation job %s failed", job_id)
+                job["message"] = str(e)
+            if job["zip_filename"]:
+                # Publish the package before /status can send anyone to its download link
+                with PACKAGE_CHANGED:
+                    PACKAGE["zip_filename"] = job["zip_filename"]
+            job["progress"] = 100
+            job["state"] = "finished" if job["zip_filename"] else "failed"
+
+    threading.Thread(target=worker, daemon=True).start()
+    return job_id
+
 # --- ROUTES ---
 
 @app.route('/', methods=['GET', 'POST'])
@@ -40,13 +92,11 @@ def manual_config():
 
 @app.route('/generate', methods=['GET', 'POST'])
 def generate():
-    zip_path = None
-    
     if request.method == 'GET':
         # Default Mode Logic (called via GET redirect from home)
         mode = request.args.get('mode')
         if mode == 'default':
-            zip_path, message = run_generation('default')
+            job_id = start_generation_job('default')
         else:
             flash("Generation mode not specified.", 'danger')
             return redirect(url_for('home'))
@@ -55,66 +105,112 @@ def generate():
         # Manual Mode Logic (called via POST from manual_config.html)
         mode = request.form.get('mode')
         if mode == 'manual':
-            manual_configs = {}
+            # Parse every count once; short videos only exist for others/twc
+            try:
+                counts = {
+                    (provider, product, vtype): int(request.form.get(f'{provider}_{product}_{vtype}', '0') or 0)
+                    for provider, products in AVAILABLE_PROVIDERS.items()
+                    for product in products
+                    for vtype in ('full_movie', 'full_episode', 'short_video')
+                    if vtype != 'short_video' or (provider, product) == ('others', 'twc')
+                }
+            except ValueError:
+                flash("Content counts must be whole numbers.", 'warning')
+                return redirect(url_for('manual_config'))
             
-            # Reconstruct the manual config dictionary from form data
-            for provider, products in AVAILABLE_PROVIDERS.items():
-                provider_has_config = False
-                manual_configs[provider] = {}
-                for product in products:
-                    product_config = {}
-                    movie_count = request.form.get(f'{provider}_{product}_full_movie', '0')
-                    episode_count = request.form.get(f'{provider}_{product}_full_episode', '0')
-                    short_count = request.form.get(f'{provider}_{product}_short_video', '0')
-                    
-                    if int(movie_count) > 0 or int(episode_count) > 0 or int(short_count) > 0:
-                        provider_has_config = True
-                    
-                    # Ensure counts are passed as integers or castable strings
-                    product_config['full_movie'] = movie_count
-                    product_config['full_episode'] = episode_count
-                    
-                    if provider == "others" and product == "twc":
-                        product_config['short_video'] = short_count
-                    
-                    manual_configs[provider][product] = product_config
-                
-                # Remove providers that were selected but had all zero counts
-                if not provider_has_config:
-                    del manual_configs[provider]
+            # Reconstruct the manual config dictionary, dropping providers with all zero counts
+            active_providers = {provider for (provider, _, _), count in counts.items() if count > 0}
+            manual_configs = {}
+            for (provider, product, vtype), count in counts.items():
+                if provider in active_providers:
+                    manual_configs.setdefault(provider, {}).setdefault(product, {})[vtype] = count
             
             if not manual_configs:
                 flash("Please enter at least one content count in Manual Mode.", 'warning')
                 return redirect(url_for('manual_config'))
             
             # Run the generation with the extracted manual configuration
-            zip_path, message = run_generation('manual', manual_configs)
+            job_id = start_generation_job('manual', manual_configs)
+        else:
+            flash("Generation mode not specified.", 'danger')
+            return redirect(url_for('home'))
 
-    if not zip_path:
-        flash(f"Error during generation: {message}", 'danger')
+    # Generation runs in the background; the progress page polls /status
+    return redirect(url_for('job_progress', job_id=job_id))
+
+@app.route('/job/<job_id>', methods=['GET'])
+def job_progress(job_id):
+    if job_id not in JOBS:
+        flash("Generation job not found.", 'danger')
         return redirect(url_for('home'))
+    
+    return render_template('progress.html', job_id=job_id)
+
+@app.route('/status/<job_id>', methods=['GET'])
+def status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify(error="Generation job not found."), 404
+    
+    return jsonify(
+        state=job["state"],
+        progress=job["progress"],
+        next_url=url_for('results', job_id=job_id)
+    )
 
-    # If generation was successful, get summary data and show results
-    content_summary, file_summary = get_summary_data()
+@app.route('/results/<job_id>', methods=['GET'])
+def results(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        flash("Generation job not found.", 'danger')
+        return redirect(url_for('home'))
     
+    if job["state"] in ("queued", "running"):
+        return redirect(url_for('job_progress', job_id=job_id))
+    
+    if job["state"] == "failed":
+        flash(f"Error during generation: {job['message']}", 'danger')
+        return redirect(url_for('home'))
+
+    # If generation was successful, show the summary saved when the job finished
     return render_template(
         'results.html', 
-        zip_filename=os.path.basename(zip_path),
-        content_summary=content_summary,
-        file_summary=file_summary
+        zip_filename=job["zip_filename"],
+        content_summary=job["content_summary"],
+        file_summary=job["file_summary"]
     )
 
 @app.route('/download/<path:filename>', methods=['GET'])
 def download(filename):
-    # The ZIP file is created in the main working directory (where app.py runs)
-    full_path = os.path.join(os.getcwd(), filename) 
+    # The ZIP is assembled from GENERATED_PACKAGES while it streams to the client,
+    # so only the package of the last finished generation can be downloaded
+    with PACKAGE_CHANGED:
+        zip_filename = PACKAGE["zip_filename"]
+        if zip_filename is None or filename != zip_filename:
+            flash("This package was replaced by a newer generation.", 'warning')
+            return redirect(url_for('home'))
+        package = stream_package()
+        if package is not None:
+            PACKAGE["downloads"] += 1
     
-    if os.path.exists(full_path):
-        return send_file(full_path, as_attachment=True)
+    if package is not None:
+        response = Response(
+            package,
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{zip_filename}"'}
+        )
+        response.call_on_close(download_finished)
+        return response
     else:
         flash("The generated package file was not found.", 'danger')
         return redirect(url_for('home'))
 
+def download_finished():
+    # Called once the response is closed, whether or not the client read all of it
+    with PACKAGE_CHANGED:
+        PACKAGE["downloads"] -= 1
+        PACKAGE_CHANGED.notify_all()
+
 if __name__ == '__main__':
     # You might need to install flask: pip install Flask
     app.run(debug=True)
\ No newline at end of file
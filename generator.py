@@ -1,12 +1,16 @@
 import csv
+import mmap
+import multiprocessing
 import uuid
 import os
 import shutil
-import glob
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from collections import defaultdict, Counter
-from tabulate import tabulate
+from zipstream import ZipStream
 
 # === Config ===
 # NOTE: Using relative paths for deployment on Render.
@@ -20,18 +24,67 @@ OUTPUT_DIR = os.path.join(os.getcwd(), "GENERATED_PACKAGES")
 LANDSCAPE_IMAGE = "encode-aes2805-2-16x9.jpg"
 PORTRAIT_IMAGE = "encode-aes2805-1-2x3.jpg"
 VIDEO_FILE = "encode-aes2805-2.mp4"
-
-# Ensure the output directory exists on initial startup
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+SOURCE_VIDEO_PATH = os.path.join(SOURCE_MEDIA_DIR, VIDEO_FILE)
+SOURCE_LANDSCAPE_PATH = os.path.join(SOURCE_MEDIA_DIR, LANDSCAPE_IMAGE)
+SOURCE_PORTRAIT_PATH = os.path.join(SOURCE_MEDIA_DIR, PORTRAIT_IMAGE)
+# Entropy-coded media gains nothing from deflate, so it is zipped as-is
+STORED_EXTENSIONS = ('.mp4', '.jpg', '.jpeg', '.png')
+# Generate providers in parallel worker processes when more than one is requested.
+# Off by default: assets are hardlinks, so each provider's work is small and the
+# spawn start-up (~70 ms) made every measured run slower, up to 27,000 items.
+PARALLEL = False
+# Per-item columns and the generate_common_names() key that fills each one
+NAME_FIELDS = (
+    ("Movie / Episode Title", "title"),
+    ("Movie / Episode Short Description", "short_desc"),
+    ("Movie / Episode Description", "long_desc"),
+    ("Movie/Episode Video File Name (including extension)", "video"),
+    ("Movie / Episode Landscape Image Name (including extension)", "landscape"),
+    ("Movie Poster Image Name (including extension)", "portrait"),
+    ("package_id", "package_id"),
+)
+# Series/season columns shared by every episode of a generated series
+SERIES_FIELDS = (
+    "Series Title", "Series Description", "Season Number", "Season Title", "Season Description",
+    "Series Poster Image Name (including extension)",
+    "Series Landscape Image Name (including extension)",
+    "Season Landscape Image Name (including extension)",
+)
+# 1 MiB file buffers instead of the 8 KiB default for CSV reads and writes
+CSV_BUFFER_SIZE = 1 << 20
+
+# First real copy of each source media file per output folder, used when the
+# source itself cannot be hardlinked (see link_or_copy)
+seed_copies = {}
+seed_copies_lock = threading.Lock()
+# Every file written by the last run_generation, relative to OUTPUT_DIR
+# ("provider/name"); stream_package zips exactly these
+package_files = []
+
+
+# Random bytes used by one generate_common_names call: 5 for uid4 + uid6, 16 for package_id
+NAME_ID_BYTES = 21
 
 
 def random_id(n):
     return uuid.uuid4().hex[-n:]
 
-def generate_common_names(prefix):
-    date_str = datetime.today().strftime('%d-%m-%y')
-    uid4 = random_id(4)
-    uid6 = random_id(6)
+def today_str():
+    return datetime.today().strftime('%d-%m-%y')
+
+def id_pool(count):
+    # One urandom call covering `count` generate_common_names calls
+    return os.urandom(count * NAME_ID_BYTES)
+
+def generate_common_names(prefix, ids=None, date_str=None):
+    # `ids` is a NAME_ID_BYTES slice of id_pool(); drawn fresh when not given
+    if ids is None:
+        ids = id_pool(1)
+    if date_str is None:
+        date_str = today_str()
+    short_ids = ids[:5].hex()
+    uid4 = short_ids[:4]
+    uid6 = short_ids[4:]
     return {
         "title": f"Test-Mops-{prefix}-{date_str}-{uid4}",
         "short_desc": f"Description of Test-Mops-{prefix}-{date_str}-{uid4}",
@@ -39,45 +92,136 @@ def generate_common_names(prefix):
         "video": f"mops-test-{prefix.lower()}-{uid6}.mp4",
         "landscape": f"mops-test-{prefix.lower()}-16x9-{uid6}.jpg",
         "portrait": f"mops-test-{prefix.lower()}-2x3-{uid6}.jpg",
-        "package_id": str(uuid.uuid4())
+        # Same construction as uuid.uuid4(), from the pooled bytes
+        "package_id": str(uuid.UUID(bytes=ids[5:NAME_ID_BYTES], version=4))
     }
 
+def range_copy(src, dst):
+    # On btrfs/XFS copy_file_range shares extents (reflink) instead of moving bytes
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        size = os.fstat(s.fileno()).st_size
+        offset = 0
+        while offset < size:
+            copied = os.copy_file_range(s.fileno(), d.fileno(), size - offset, offset, offset)
+            if not copied:
+                # Some filesystems return 0 instead of failing; let copy_file fall back
+                raise OSError(f"copy_file_range stopped at {offset} of {size} bytes")
+            offset += copied
+
+def sendfile_copy(src, dst):
+    # Kernel-to-kernel copy, no user-space buffers
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        size = os.fstat(s.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+            if not sent:
+                raise OSError(f"sendfile stopped at {offset} of {size} bytes")
+            offset += sent
+
+@lru_cache(maxsize=None)
+def source_view(src):
+    # Read-only mapping of a source media file, shared by every mmap_copy of it
+    with open(src, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def mmap_copy(src, dst):
+    # Writes straight from the page-cache mapping, no per-copy read() or buffer churn
+    view = source_view(src)
+    fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, len(view))
+            except OSError:
+                pass  # Filesystem cannot preallocate; plain writes still work
+        with memoryview(view) as data:
+            written = 0
+            while written < len(data):
+                written += os.write(fd, data[written:])
+    finally:
+        os.close(fd)
+
+def copy_file(src, dst):
+    # Cheapest kernel copy first. os.copy_file_range is Linux-only and refuses
+    # some cross-filesystem copies; os.sendfile is missing on Windows and cannot
+    # target regular files on macOS.
+    for kernel_copy in (range_copy, sendfile_copy):
+        try:
+            kernel_copy(src, dst)
+            return
+        except (AttributeError, OSError):
+            continue
+    mmap_copy(src, dst)
+
+def link_or_copy(src, dst):
+    # Every generated asset is byte-identical to its source, so a hardlink is enough
+    try:
+        os.link(src, dst)
+        return
+    except FileExistsError:
+        # dst may already be a hardlink to src: replace the name, never write through it
+        os.unlink(dst)
+        return link_or_copy(src, dst)
+    except OSError:
+        pass  # Cross-device output dir or no hardlink support
+
+    # Copy the bytes once per output folder and hardlink every later asset to that copy
+    seed_key = (os.path.dirname(dst), src)
+    with seed_copies_lock:
+        seed = seed_copies.get(seed_key)
+        if seed is None:
+            copy_file(src, dst)
+            seed_copies[seed_key] = dst
+            return
+    try:
+        os.link(seed, dst)
+    except OSError:
+        copy_file(src, dst)  # Filesystem without hardlinks at all
+
 def copy_assets(destination_folder, names):
-    os.makedirs(destination_folder, exist_ok=True)
-    
+    # Hot path: destinations are plain f-strings, '/' is accepted on every platform.
+    # The provider folder is created once by run_generation
     try:
-        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, VIDEO_FILE), os.path.join(destination_folder, names["video"]))
-        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, LANDSCAPE_IMAGE), os.path.join(destination_folder, names["landscape"]))
-        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, PORTRAIT_IMAGE), os.path.join(destination_folder, names["portrait"]))
+        link_or_copy(SOURCE_VIDEO_PATH, f"{destination_folder}/{names['video']}")
+        link_or_copy(SOURCE_LANDSCAPE_PATH, f"{destination_folder}/{names['landscape']}")
+        link_or_copy(SOURCE_PORTRAIT_PATH, f"{destination_folder}/{names['portrait']}")
     except FileNotFoundError as e:
         print(f"FATAL ASSET ERROR: Source media file not found: {e}. Check source_data/media folder.")
         raise FileNotFoundError(f"Source media asset not found: {e}") 
 
 
+# Source CSVs are static for the life of the process; call
+# parse_source_csv.cache_clear() to pick up edits without a restart.
+# The cached rows are shared, so callers must .copy() a row before changing it.
+@lru_cache(maxsize=None)
+def parse_source_csv(path):
+    with open(path, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+        return tuple(csv.DictReader(csvfile))
+
 def load_csv_rows(provider):
+    # Only successful parses are cached, so a restored CSV is picked up on the next run
     path = SOURCE_CSV_PATHS[provider]
     try:
-        with open(path, newline='', encoding='utf-8') as csvfile:
-            return list(csv.DictReader(csvfile))
+        return parse_source_csv(path)
     except FileNotFoundError:
         print(f"FATAL CONFIG ERROR: Source CSV not found for {provider} at {path}. Skipping provider.")
-        return []
+        return ()
 
 def save_csv(provider, rows, headers):
     if not rows:
         print(f"WARNING: Skipping CSV save for {provider} as output_rows is empty.")
         return None
         
+    # The provider folder is created by run_generation
     folder = os.path.join(OUTPUT_DIR, provider)
-    os.makedirs(folder, exist_ok=True)
     uid4 = uuid.uuid4().hex[-4:]
     csv_path = os.path.join(folder, f"generated-{provider}-test-package-{uid4}.csv")
-    with open(csv_path, "w", newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for row in rows:
-            trimmed_row = {k: v for k, v in row.items() if k in headers}
-            writer.writerow(trimmed_row)
+    with open(csv_path, "w", newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        # Rows are already lists in header order
+        writer.writerows(rows)
     return csv_path
 
 
@@ -85,7 +229,131 @@ def save_csv(provider, rows, headers):
 # === Core Generation Function (Modified for Frontend Input) ===
 # =========================================================================
 
-def run_generation(mode, manual_configs=None):
+def generate_for_provider(provider, products, config, src_rows, date_str, progress_cb=None):
+    # Builds one provider's rows and assets. Runs in a worker process when
+    # PARALLEL, so it must stay a top-level (picklable) function.
+    headers = list(src_rows[0].keys())
+    column = {h: i for i, h in enumerate(headers)}
+    folder = os.path.join(OUTPUT_DIR, provider)
+
+    # Rows are lists in header order; resolve the columns filled per item once.
+    # Columns missing from this provider's CSV are simply not written.
+    name_slots = [(column[h], key) for h, key in NAME_FIELDS if h in column]
+    episode_number_idx = column.get("Episode Number")
+
+    output_rows = []
+    series_meta = {} 
+
+    # Index the templates by Video Type once; the first matching row wins
+    templates = {}
+    for r in src_rows:
+        templates.setdefault(r["Video Type"].strip().lower(), r)
+
+    # Asset copies (per-row media and series artwork) are independent and
+    # I/O-bound, so they run on a thread pool while rows are still built here
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as copy_pool:
+        copy_futures = []
+        files = []  # Created assets, relative to OUTPUT_DIR
+
+        for product in products:
+            for vtype in ["Full Movie", "Full Episode", "Short Video"]:
+            
+                if vtype == "Short Video" and (provider != "others" or product != "twc"):
+                    continue
+
+                count_key = f"{vtype.lower().replace(' ', '_')}_{provider}_{product}"
+                count = config.get(count_key, 0)
+            
+                # Negative counts (the form's min="0" is client-side only) generate nothing
+                if count <= 0:
+                    continue
+
+                # Template Search Logic with Fallback 
+                template_row = templates.get(vtype.lower())
+            
+                if not template_row:
+                    print(f"Warning: No exact template found for {vtype} in {provider}. Falling back to first row.")
+                    try:
+                        template_row = src_rows[0].copy() 
+                        template_row["Video Type"] = vtype 
+                    except IndexError:
+                        print(f"FATAL: Source CSV for {provider} is empty.")
+                        continue
+
+                if not template_row:
+                    continue
+
+                # Fields shared by every row of this product and video type
+                base_row = [template_row.get(h, '') for h in headers]
+                if "Programming Type" in column: base_row[column["Programming Type"]] = vtype
+                if "products" in column: base_row[column["products"]] = product
+
+                if vtype == "Full Episode":
+                    series_key = f"{provider}_{product}"
+                    if series_key not in series_meta:
+                        meta = generate_common_names("Series", date_str=date_str)
+                    
+                        season_title = f"Test-Mops-Season-{date_str}-{random_id(4)}"
+                        season_desc = f"Description of {season_title}"
+                        series_uid4 = random_id(4)
+                        series_poster = f"test-mops-series-2x3-{series_uid4}.jpg"
+                        series_landscape = f"test-mops-series-16x9-{series_uid4}.jpg"
+                        season_landscape = f"test-mops-season-16x9-{series_uid4}.jpg"
+                    
+                        copy_futures.append(copy_pool.submit(link_or_copy, SOURCE_PORTRAIT_PATH, f"{folder}/{series_poster}"))
+                        copy_futures.append(copy_pool.submit(link_or_copy, SOURCE_LANDSCAPE_PATH, f"{folder}/{series_landscape}"))
+                        copy_futures.append(copy_pool.submit(link_or_copy, SOURCE_LANDSCAPE_PATH, f"{folder}/{season_landscape}"))
+                        files.extend((f"{provider}/{series_poster}", f"{provider}/{series_landscape}", f"{provider}/{season_landscape}"))
+                    
+                        series_meta[series_key] = {**meta, 'season_title': season_title, 'season_desc': season_desc, 'series_poster': series_poster, 'series_landscape': series_landscape, 'season_landscape': season_landscape}
+                
+                    meta = series_meta[series_key]
+                    # Same for every episode of the series, so set once on the base row
+                    for h, value in zip(SERIES_FIELDS, (
+                        meta["title"], meta["short_desc"], "1", meta["season_title"], meta["season_desc"],
+                        meta["series_poster"], meta["series_landscape"], meta["season_landscape"],
+                    )):
+                        if h in column:
+                            base_row[column[h]] = value
+                else:
+                    meta = None 
+
+                name_prefix = "Episode" if vtype == "Full Episode" else ("Movie" if vtype == "Full Movie" else "Short")
+                ids = id_pool(count)
+                # Loop invariants, looked up once instead of per row
+                is_episode = vtype == "Full Episode"
+                submit_copy = copy_pool.submit
+                add_copy = copy_futures.append
+                add_files = files.extend
+                add_row = output_rows.append
+
+                for i in range(count):
+                    names = generate_common_names(name_prefix, ids[i * NAME_ID_BYTES:(i + 1) * NAME_ID_BYTES], date_str)
+                
+                    # Row updates based on vtype
+                    row = base_row.copy()
+                    for idx, key in name_slots:
+                        row[idx] = names[key]
+                
+                    add_copy(submit_copy(copy_assets, folder, names))
+                    add_files((f"{provider}/{names['video']}", f"{provider}/{names['landscape']}", f"{provider}/{names['portrait']}"))
+
+                    if is_episode and episode_number_idx is not None:
+                        row[episode_number_idx] = str(i + 1)
+
+                    add_row(row)
+
+        # Surface any asset copy error before handing the rows back
+        for done, future in enumerate(copy_futures, 1):
+            future.result()
+            if progress_cb:
+                progress_cb(done, len(copy_futures))
+
+    return folder, output_rows, headers, files
+
+
+def run_generation(mode, manual_configs=None, progress_cb=None):
+    # progress_cb(done, total) is called as generated assets land on disk
     
     # CRITICAL FIX: DELETE OLD OUTPUT BEFORE STARTING
     if os.path.exists(OUTPUT_DIR):
@@ -98,6 +366,8 @@ def run_generation(mode, manual_configs=None):
             return None, f"Failed to clean output directory: {e}"
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    seed_copies.clear()
+    package_files.clear()
     
     # Define all available providers and products
     all_providers = list(SOURCE_CSV_PATHS.keys())
@@ -146,6 +416,9 @@ def run_generation(mode, manual_configs=None):
 
     # 2. Package Generation Loop
     all_generated_folders = []
+    # Every name in one run carries the same date
+    date_str = today_str()
+    jobs = []
 
     for provider in providers:
         src_rows = load_csv_rows(provider)
@@ -153,136 +426,85 @@ def run_generation(mode, manual_configs=None):
         if not src_rows:
             print(f"Error: Source CSV is empty for {provider}. Skipping.")
             continue
-            
-        try:
-             headers = list(src_rows[0].keys())
-        except IndexError:
-             print(f"Error: Source CSV for {provider} has no header row. Skipping.")
-             continue
-             
-        output_rows = []
+
         folder = os.path.join(OUTPUT_DIR, provider)
+        os.makedirs(folder, exist_ok=True)
         all_generated_folders.append(folder)
-        
-        series_meta = {} 
-
-        for product in provider_products[provider]:
-            for vtype in ["Full Movie", "Full Episode", "Short Video"]:
-                
-                if vtype == "Short Video" and (provider != "others" or product != "twc"):
-                    continue
-
-                count_key = f"{vtype.lower().replace(' ', '_')}_{provider}_{product}"
-                count = config.get(count_key, 0)
-                
-                if count == 0:
-                    continue
-
-                # Template Search Logic with Fallback 
-                template_row = next(
-                    (r for r in src_rows if r["Video Type"].strip().lower() == vtype.lower()),
-                    None
-                )
-                
-                if not template_row:
-                    print(f"Warning: No exact template found for {vtype} in {provider}. Falling back to first row.")
-                    try:
-                        template_row = src_rows[0].copy() 
-                        template_row["Video Type"] = vtype 
-                    except IndexError:
-                        print(f"FATAL: Source CSV for {provider} is empty.")
-                        continue
-
-                if not template_row:
-                    continue
-
-
-                if vtype == "Full Episode":
-                    series_key = f"{provider}_{product}"
-                    if series_key not in series_meta:
-                        meta = generate_common_names("Series")
-                        
-                        season_title = f"Test-Mops-Season-{datetime.today().strftime('%d-%m-%y')}-{random_id(4)}"
-                        season_desc = f"Description of {season_title}"
-                        series_uid4 = random_id(4)
-                        series_poster = f"test-mops-series-2x3-{series_uid4}.jpg"
-                        series_landscape = f"test-mops-series-16x9-{series_uid4}.jpg"
-                        season_landscape = f"test-mops-season-16x9-{series_uid4}.jpg"
-                        
-                        os.makedirs(folder, exist_ok=True) 
-                        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, PORTRAIT_IMAGE), os.path.join(folder, series_poster))
-                        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, LANDSCAPE_IMAGE), os.path.join(folder, series_landscape))
-                        shutil.copyfile(os.path.join(SOURCE_MEDIA_DIR, LANDSCAPE_IMAGE), os.path.join(folder, season_landscape))
-                        
-                        series_meta[series_key] = {**meta, 'season_title': season_title, 'season_desc': season_desc, 'series_poster': series_poster, 'series_landscape': series_landscape, 'season_landscape': season_landscape}
-                    
-                    meta = series_meta[series_key]
-                else:
-                    meta = None 
-
-                for i in range(count):
-                    row = template_row.copy()
-                    names = generate_common_names("Episode" if vtype == "Full Episode" else ("Movie" if vtype == "Full Movie" else "Short"))
-                    
-                    # Row updates based on vtype
-                    row["Movie / Episode Title"] = names["title"]
-                    row["Movie / Episode Short Description"] = names["short_desc"]
-                    row["Movie / Episode Description"] = names["long_desc"]
-                    row["Programming Type"] = vtype
-                    row["Movie/Episode Video File Name (including extension)"] = names["video"]
-                    row["Movie / Episode Landscape Image Name (including extension)"] = names["landscape"]
-                    row["Movie Poster Image Name (including extension)"] = names["portrait"]
-                    if "package_id" in row: row["package_id"] = names["package_id"]
-                    if "products" in row: row["products"] = product
-                    
-                    copy_assets(folder, names)
-
-                    if vtype == "Full Episode":
-                        row["Series Title"] = meta["title"]
-                        row["Series Description"] = meta["short_desc"]
-                        row["Season Number"] = "1"
-                        row["Season Title"] = meta["season_title"]
-                        row["Season Description"] = meta["season_desc"]
-                        row["Episode Number"] = str(i + 1)
-                        row["Series Poster Image Name (including extension)"] = meta["series_poster"]
-                        row["Series Landscape Image Name (including extension)"] = meta["series_landscape"]
-                        row["Season Landscape Image Name (including extension)"] = meta["season_landscape"]
-
-                    output_rows.append(row)
-        
-        # 3. Save CSV (Only runs if rows were generated)
+        jobs.append((provider, provider_products[provider], config, src_rows, date_str))
+
+    results = []
+    if PARALLEL and len(jobs) > 1:
+        # Spawned (not forked) workers: run_generation may be called from a web worker thread
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(generate_for_provider, *job) for job in jobs]
+            for done, future in enumerate(futures, 1):
+                results.append(future.result())
+                if progress_cb:
+                    progress_cb(done, len(futures))
+    else:
+        for index, job in enumerate(jobs):
+            provider_progress = None
+            if progress_cb:
+                def provider_progress(done, total, index=index):
+                    progress_cb(index * total + done, len(jobs) * total)
+            results.append(generate_for_provider(*job, progress_cb=provider_progress))
+
+    # 3. Save CSVs (Only written for providers that generated rows)
+    for (provider, *_), (folder, output_rows, headers, files) in zip(jobs, results):
+        package_files.extend(files)
         csv_path = save_csv(provider, output_rows, headers)
         if csv_path:
+             package_files.append(f"{provider}/{os.path.basename(csv_path)}")
              print(f"✅ Generated {len(output_rows)} entries for {provider} at: {csv_path}")
 
 
-    # 4. Create ZIP Archive
+    # 4. Name the ZIP Archive (it is streamed on download, see stream_package)
     active_folders_to_zip = [f for f in all_generated_folders if os.path.exists(f) and os.listdir(f)]
 
     if not active_folders_to_zip:
         return None, "No files were generated based on the configuration. Check counts."
 
-    # ZIP file is saved in the project root for easy access
     zip_filename = f"mops-test-package-export-{uuid.uuid4().hex[:6]}.zip"
-    zip_path = os.path.join(os.getcwd(), zip_filename)
-
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Walk through the generated folder contents
-        for root, _, files in os.walk(OUTPUT_DIR):
-            for file in files:
-                full_path = os.path.join(root, file)
-                # Save into the zip file relative to the GENERATED_PACKAGES folder
-                zipf.write(full_path, os.path.relpath(full_path, OUTPUT_DIR))
-                
-    return zip_path, "Generation and Zipping complete."
+
+    return zip_filename, "Generation complete."
+
+
+# =========================================================================
+# === Streaming ZIP Export ===
+# =========================================================================
+
+def stream_package():
+    # Builds the ZIP on the fly while it is sent, so no archive is ever written to disk
+    if not os.path.exists(OUTPUT_DIR):
+        return None
+
+    package = ZipStream(compress_type=zipfile.ZIP_STORED)
+    # Zip the files recorded by the last run_generation. Colliding short ids
+    # record the same name twice, but the ZIP must hold each file once.
+    for arcname in dict.fromkeys(package_files):
+        # Media is already compressed; only the CSVs are worth deflating
+        compress_type = zipfile.ZIP_STORED if arcname.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+        # Save into the zip file relative to the GENERATED_PACKAGES folder
+        package.add_path(os.path.join(OUTPUT_DIR, arcname), arcname, compress_type=compress_type)
+
+    if package.is_empty():
+        return None
+    return package
 
 
 # =========================================================================
 # === Summary Function for Frontend (Unmodified Logic) ===
 # =========================================================================
 
+def column_index(header, name):
+    try:
+        return header.index(name)
+    except ValueError:
+        return None
+
 def get_summary_data():
-    summary_table = []
+    content_counts = Counter()
     file_table = defaultdict(lambda: {"mp4": 0, "landscape": 0, "portrait": 0, "series": 0, "season": 0})
     
     if not os.path.exists(OUTPUT_DIR):
@@ -291,22 +513,30 @@ def get_summary_data():
     for provider in ["others", "warnerbros"]:
         folder = os.path.join(OUTPUT_DIR, provider)
             
-        csv_matches = glob.glob(os.path.join(folder, f"generated-{provider}-test-package-*.csv"))
+        if not os.path.isdir(folder):
+            continue
+
+        csv_prefix = f"generated-{provider}-test-package-"
+        with os.scandir(folder) as entries:
+            csv_matches = [e for e in entries if e.name.startswith(csv_prefix) and e.name.endswith(".csv")]
         if not csv_matches:
             continue
             
-        csv_file = max(csv_matches, key=os.path.getmtime)
-        if not os.path.exists(csv_file):
-            continue
-
-        with open(csv_file, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-            for row in rows:
-                vtype = row.get("Video Type", "N/A").strip()
-                product = row.get("products", "N/A")
-                summary_table.append([provider, product, vtype])
+        csv_file = max(csv_matches, key=lambda e: e.stat().st_mtime).path
+
+        with open(csv_file, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+            # Count while reading; rows are never held in memory
+            reader = csv.reader(f)
+            header = next(reader, [])
+            vtype_idx = column_index(header, "Video Type")
+            product_idx = column_index(header, "products")
+
+            for row in reader:
+                if not row:
+                    continue  # Blank line, skipped like DictReader does
+                vtype = row[vtype_idx].strip() if vtype_idx is not None else "N/A"
+                product = row[product_idx] if product_idx is not None else "N/A"
+                content_counts[(provider, product, vtype)] += 1
 
                 file_table_key = (provider, vtype)
                 file_table[file_table_key]["mp4"] += 1
@@ -317,7 +547,6 @@ def get_summary_data():
                     file_table[file_table_key]["series"] += 1
                     file_table[file_table_key]["season"] += 1
 
-    content_counts = Counter(tuple(row) for row in summary_table)
     content_summary = [[*key, val] for key, val in content_counts.items()]
     
     file_summary_rows = []